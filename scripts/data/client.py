@@ -14,7 +14,7 @@ from pathlib import Path
 import random
 import signal
 from generate_data import generate_data
-from format_args import format_args
+from format_args import format_args_to_cairo_serde, json_dumps
 from logging.handlers import TimedRotatingFileHandler
 
 logger = logging.getLogger(__name__)
@@ -26,6 +26,11 @@ QUEUE_MAX_SIZE = THREAD_POOL_SIZE * 2  # Maximum size of the job queue
 
 BASE_DIR = Path(".client_cache")
 
+# Failure markers in the client output, "error" alone may appear in benign lines
+FAIL_RE = re.compile(r"^FAIL|panicked", re.MULTILINE)
+# Failures are reported at the end of the output, only its tail is searched
+OUTPUT_TAIL_SIZE = 8192
+
 # Shared state variables
 current_weight = 0
 weight_lock = threading.Condition()
@@ -120,7 +125,7 @@ def job_generator(start, blocks, step, mode, strategy):
                 mode=mode, initial_height=height, num_blocks=step, fast=True
             )
 
-            Path(batch_file).write_text(json.dumps(batch_data, indent=2))
+            batch_file.write_text(json.dumps(batch_data, indent=2))
 
             batch_weight = calculate_batch_weight(batch_data, mode)
             yield Job(
@@ -135,10 +140,9 @@ def job_generator(start, blocks, step, mode, strategy):
 
 
 def process_batch(job):
-    arguments_file = job.batch_file.as_posix().replace(".json", "-arguments.json")
+    arguments_file = job.batch_file.with_name(job.batch_file.stem + "-arguments.json")
 
-    with open(arguments_file, "w") as af:
-        af.write(str(format_args(job.batch_file)))
+    arguments_file.write_bytes(json_dumps(format_args_to_cairo_serde(job.batch_file)))
 
     stdout, stderr, returncode = run(
         [
@@ -154,7 +158,7 @@ def process_batch(job):
         ]
     )
 
-    if returncode != 0 or "FAIL" in stdout or "error" in stdout or "panicked" in stdout:
+    if returncode != 0 or FAIL_RE.search(stdout[-OUTPUT_TAIL_SIZE:]):
         error = stdout or stderr
         if returncode == -9:
             match = re.search(r"gas_spent=(\d+)", stdout)
@@ -2,8 +2,30 @@
 
 import argparse
 import json
+import struct
+from itertools import islice
 from pathlib import Path
 
+try:
+    import orjson
+
+    def json_dumps(obj, pretty=False) -> bytes:
+        """Serializes object to JSON bytes, optionally indented with 2 spaces."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+
+    json_loads = orjson.loads
+
+except ImportError:
+
+    def json_dumps(obj, pretty=False) -> bytes:
+        """Serializes object to JSON bytes, optionally indented with 2 spaces."""
+        if pretty:
+            return json.dumps(obj, indent=2).encode()
+        # Compact separators, same output as orjson
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    json_loads = json.loads
+
 
 def serialize(obj):
     """Serializes Cairo data in JSON format to a Python object with reduced types.
@@ -49,8 +71,7 @@ def serialize(obj):
         else:
             # Reversed hex string into 4-byte words then into BE u32
             assert len(obj) == 64, f"expected 32-byte hash: {obj}"
-            rev = list(reversed(bytes.fromhex(obj)))
-            return tuple(int.from_bytes(rev[i : i + 4], "big") for i in range(0, 32, 4))
+            return struct.unpack(">8I", bytes.fromhex(obj)[::-1])
     elif isinstance(obj, list):
         arr = list(map(serialize, obj))
         return tuple([len(arr)] + arr)
@@ -92,6 +113,40 @@ def flatten_tuples(src) -> list:
     return res
 
 
+def iter_flatten_tuples(src):
+    """Lazily flattens tuples, yielding the same items as `flatten_tuples`.
+
+    :param src: an object that can be int|list|tuple or their nested combination.
+    :return: an iterator over integers and lists.
+    """
+    stack = [iter((src,))]
+    while stack:
+        for obj in stack[-1]:
+            if isinstance(obj, tuple):
+                stack.append(iter(obj))
+                break
+            elif isinstance(obj, int):
+                yield obj
+            else:
+                yield from flatten_tuples(obj)
+        else:
+            stack.pop()
+
+
+def format_args_from_dict(args):
+    """Formats arguments given as a Python object and returns result as a list of hex values.
+    Output is compatible with the Scarb runner arguments format.
+
+    Args:
+        args (dict): Arguments in the same form as in the input JSON file
+
+    Returns:
+        list: List of hex values representing the Cairo serde format
+    """
+    res = flatten_tuples(serialize(args))
+    return list(map(hex, res))
+
+
 def format_args_to_cairo_serde(input_file):
     """Reads arguments from JSON file and returns formatted result as a list of hex values.
     Output is compatible with the Scarb runner arguments format.
@@ -103,8 +158,24 @@ def format_args_to_cairo_serde(input_file):
         list: List of hex values representing the Cairo serde format
     """
     args = json.loads(Path(input_file).read_text())
-    res = flatten_tuples(serialize(args))
-    return list(map(hex, res))
+    return format_args_from_dict(args)
+
+
+def iter_cairo_serde(args, chunk_size=4096):
+    """Formats arguments given as a Python object and yields result in encoded chunks.
+    Each chunk is a comma separated sequence of up to `chunk_size` JSON strings
+    with hex values, so that the full list is never materialized.
+
+    Args:
+        args (dict): Arguments in the same form as in the input JSON file
+        chunk_size (int): Maximum number of values per chunk
+
+    Yields:
+        bytes: Comma separated hex values in JSON format
+    """
+    values = map(hex, iter_flatten_tuples(serialize(args)))
+    while chunk := list(islice(values, chunk_size)):
+        yield json_dumps(chunk)[1:-1]
 
 
 def format_args(input_file):
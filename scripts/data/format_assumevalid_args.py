@@ -1,9 +1,19 @@
 #!/usr/bin/env python3
 
 import argparse
-import json
+import mmap
+import os
+import shutil
 from pathlib import Path
-from format_args import format_args_to_cairo_serde
+from format_args import (
+    format_args_to_cairo_serde,
+    iter_cairo_serde,
+    json_dumps,
+    json_loads,
+)
+
+# Buffer size for reading and writing large argument and proof files
+IO_BUFFER_SIZE = 1 << 20
 
 
 def read_proof_file(proof_path):
@@ -15,8 +25,51 @@ def read_proof_file(proof_path):
     Returns:
         list: List of hex values from the proof file
     """
-    with open(proof_path, "r") as f:
-        return json.loads(f.read())
+    with open(proof_path, "rb", buffering=IO_BUFFER_SIZE) as f:
+        return json_loads(f.read())
+
+
+def copy_proof_items(proof_path, output):
+    """Copy items of the proof list into the output stream as raw bytes.
+
+    Proof file is a JSON list of hex values, so the part between the outer
+    brackets can be spliced into another JSON list without being parsed.
+    Where supported, the bytes are copied by the kernel with os.sendfile.
+
+    Args:
+        proof_path (str): Path to the proof file
+        output (BinaryIO): Output file, positioned after a list item
+
+    Raises:
+        ValueError: If the proof file does not contain a JSON list
+    """
+    with open(proof_path, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as buf:
+        start = buf.find(b"[") + 1
+        end = buf.rfind(b"]")
+        if start == 0 or end < start:
+            raise ValueError(f"Proof file {proof_path} does not contain a JSON list")
+        while start < end and buf[start : start + 1].isspace():
+            start += 1
+        while end > start and buf[end - 1 : end].isspace():
+            end -= 1
+        if start == end:
+            return
+
+        output.write(b",")
+        output.flush()
+        try:
+            sent = os.sendfile(output.fileno(), f.fileno(), start, end - start)
+        except (AttributeError, OSError):
+            # No sendfile or it does not support regular files (e.g. macOS)
+            sent = 0
+        start += sent
+        while sent and start < end:
+            sent = os.sendfile(output.fileno(), f.fileno(), start, end - start)
+            start += sent
+        if start < end:
+            output.write(buf[start:end])
 
 
 def generate_assumevalid_args(block_data_path, proof_path=None):
@@ -43,6 +96,70 @@ def generate_assumevalid_args(block_data_path, proof_path=None):
     return result
 
 
+def write_block_args(output, block_data, cache_file=None):
+    """Write block data arguments to the output stream as comma terminated hex values.
+
+    If `block_data` is None, previously formatted arguments are copied from `cache_file`.
+    Otherwise they are formatted and, if `cache_file` is set, saved there as well.
+
+    Args:
+        output (BinaryIO): Output stream
+        block_data (str|dict): Path to the block data JSON file or the block data itself
+        cache_file (Path, optional): File with cached formatted arguments
+    """
+    if block_data is None:
+        with open(cache_file, "rb", buffering=0) as f:
+            shutil.copyfileobj(f, output, IO_BUFFER_SIZE)
+        return
+
+    if isinstance(block_data, dict):
+        args = block_data
+    else:
+        args = json_loads(Path(block_data).read_bytes())
+
+    if cache_file is None:
+        for chunk in iter_cairo_serde(args):
+            output.write(chunk)
+            output.write(b",")
+        return
+
+    cache_file = Path(cache_file)
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_suffix(".tmp")
+    with open(tmp_file, "wb", buffering=IO_BUFFER_SIZE) as f:
+        for chunk in iter_cairo_serde(args):
+            for stream in (output, f):
+                stream.write(chunk)
+                stream.write(b",")
+    # Rename only complete entries into place
+    os.replace(tmp_file, cache_file)
+
+
+def write_assumevalid_args(output_path, block_data, proof_path=None, cache_file=None):
+    """Generate assumevalid arguments with optional proof and write them to a file.
+
+    Unlike `generate_assumevalid_args`, the arguments are streamed to the output
+    in chunks and the proof is copied as is, without being parsed and serialized
+    again.
+
+    Args:
+        output_path (str): Path to the resulting JSON file
+        block_data (str|dict): Path to the block data JSON file or the block data itself,
+            None to take formatted arguments from `cache_file`
+        proof_path (str, optional): Path to the proof file
+        cache_file (Path, optional): File with cached formatted arguments
+    """
+    with open(output_path, "wb", buffering=IO_BUFFER_SIZE) as f:
+        f.write(b"[")
+        write_block_args(f, block_data, cache_file)
+        if proof_path:
+            f.write(b'"0x0"')  # Proof exists
+            copy_proof_items(proof_path, f)
+        else:
+            f.write(b'"0x1"')  # No proof (None)
+        f.write(b"]")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Generate assumevalid arguments with optional proof."
@@ -71,14 +188,21 @@ def main():
         help="Path to save the resulting JSON file",
     )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        "--pretty",
+        dest="pretty",
+        action="store_true",
+        help="Indent the resulting JSON file for debugging",
+    )
 
-    # Generate the arguments
-    result = generate_assumevalid_args(args.block_data, args.proof_path)
+    args = parser.parse_args()
 
-    # Write the result to the output file
-    with open(args.output_path, "w") as f:
-        json.dump(result, f, indent=2)
+    # Generate the arguments and write them to the output file
+    if args.pretty:
+        result = generate_assumevalid_args(args.block_data, args.proof_path)
+        Path(args.output_path).write_bytes(json_dumps(result, pretty=True))
+    else:
+        write_assumevalid_args(args.output_path, args.block_data, args.proof_path)
 
 
 if __name__ == "__main__":
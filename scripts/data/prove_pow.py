@@ -1,18 +1,24 @@
 #!/usr/bin/env python3
 
-import json
-import re
 import os
+import hashlib
 import argparse
 import subprocess
+import shutil
+import tempfile
+import threading
+import time
+import platform
+import resource
+import signal
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from generate_data import generate_data
-from format_args import format_args
-from format_assumevalid_args import generate_assumevalid_args
-from logging.handlers import TimedRotatingFileHandler
+from format_args import json_dumps, json_loads
+from format_assumevalid_args import write_assumevalid_args
 import traceback
-import colorlog
 from dataclasses import dataclass
 from typing import Optional
 import datetime
@@ -21,13 +27,29 @@ logger = logging.getLogger(__name__)
 
 TMP_DIR = Path(".tmp")
 PROOF_DIR = Path(".proofs")
+ARGS_CACHE_DIR = Path(".cache/args")
+# Modules that produce the cached block arguments, part of the cache version
+ARGS_CACHE_SOURCES = [
+    "generate_data.py",
+    "format_args.py",
+    "format_assumevalid_args.py",
+]
+EXECUTABLE = Path("../../target/proving/assumevalid.executable.json")
+PROVER_PARAMS = Path("../../packages/assumevalid/prover_params.json")
+IS_MACOS = platform.system() == "Darwin"
+# Waiting for a process without reaping it is not supported on macOS
+HAS_WAITID = hasattr(os, "waitid")
+# Only the end of a failed process output is logged, full output is in step logs
+ERROR_TAIL_SIZE = 8192
+# Interval in seconds between samples of the peak memory of a running process
+MEMORY_SAMPLE_INTERVAL = 0.05
 
 
 @dataclass
 class StepInfo:
     step: str
-    stdout: str
-    stderr: str
+    stdout: bytes
+    stderr: bytes
     returncode: int
     elapsed: float
     max_memory: Optional[int]
@@ -41,6 +63,16 @@ def setup_logging(verbose=False, log_filename="proving.log"):
         verbose (bool): If True, set DEBUG level; otherwise INFO level
         log_filename (str): Name of the log file
     """
+    # Configure only once, repeated calls would attach duplicate handlers.
+    # Also keep the configuration of a script importing this module, if any.
+    root_logger = logging.getLogger()
+    if root_logger.handlers:
+        return
+
+    # Imported lazily so that importing this module as a library stays cheap
+    from logging.handlers import TimedRotatingFileHandler
+    import colorlog
+
     # File handler setup
     file_handler = TimedRotatingFileHandler(
         filename=log_filename,
@@ -71,7 +103,6 @@ def setup_logging(verbose=False, log_filename="proving.log"):
     )
 
     # Root logger setup
-    root_logger = logging.getLogger()
     root_logger.addHandler(console_handler)
     root_logger.addHandler(file_handler)
 
@@ -86,53 +117,120 @@ def setup_logging(verbose=False, log_filename="proving.log"):
     logging.getLogger("generate_data").setLevel(logging.WARNING)
 
 
-def run(cmd, timeout=None):
-    """Run a subprocess and measure execution time and memory usage (Linux only, using /usr/bin/time -v)"""
-    import time
-    import platform
-    import re
+class PeakMemorySampler(threading.Thread):
+    """
+    Sample the peak resident set size (VmHWM) of a running process on Linux.
+    Unlike ru_maxrss, it is not affected by the memory of the parent process.
+    Growth during the last interval before the process exits is not observed.
+    """
 
-    if platform.system() != "Linux":
-        raise RuntimeError(
-            "This script only supports Linux for timing and memory measurement."
-        )
-    # Prepend /usr/bin/time -v to the command
-    time_cmd = ["/usr/bin/time", "-v"] + cmd
-    start_time = time.time()
+    def __init__(self, pid):
+        super().__init__(daemon=True)
+        self.status_file = f"/proc/{pid}/status"
+        self.samples = []
+        self.stopped = threading.Event()
+
+    def run(self):
+        while True:
+            try:
+                with open(self.status_file, "rb") as f:
+                    for line in f:
+                        if line.startswith(b"VmHWM:"):
+                            self.samples.append(int(line.split()[1]))
+                            break
+            except OSError:
+                # No procfs or the process is gone
+                return
+            if self.stopped.wait(MEMORY_SAMPLE_INTERVAL):
+                return
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+    @property
+    def peak(self):
+        """
+        Sampled peak memory in kilobytes, or None if the process was not
+        observed for a full interval, since a single early sample is meaningless.
+        """
+        return self.samples[-1] if len(self.samples) > 1 else None
+
+
+def run(cmd, stdout, stderr, timeout=None):
+    """
+    Run a subprocess and measure execution time and peak memory usage of the child process.
+    Output of the process is written to the given `stdout` and `stderr` files.
+    Peak memory is None if it cannot be measured reliably, e.g. for short-lived processes.
+    Returns a tuple: (returncode, elapsed, max_memory)
+    """
+    start_time = time.perf_counter()
+    # Spawn directly rather than with Popen, since the child is reaped here
+    pid = os.posix_spawnp(
+        cmd[0],
+        cmd,
+        os.environ,
+        file_actions=[
+            (os.POSIX_SPAWN_DUP2, stdout.fileno(), 1),
+            (os.POSIX_SPAWN_DUP2, stderr.fileno(), 2),
+        ],
+    )
+    timed_out = threading.Event()
+
+    def kill():
+        timed_out.set()
+        os.kill(pid, signal.SIGKILL)
+
+    timer = threading.Timer(timeout, kill) if timeout else None
+    if timer:
+        timer.start()
+    sampler = PeakMemorySampler(pid)
+    sampler.start()
     try:
-        result = subprocess.run(
-            time_cmd, capture_output=True, text=True, check=False, timeout=timeout
-        )
-        elapsed = time.time() - start_time
-        # /usr/bin/time -v outputs memory usage to stderr
-        max_mem_match = re.search(
-            r"Maximum resident set size \(kbytes\): (\d+)", result.stderr
-        )
-        max_memory = int(max_mem_match.group(1)) if max_mem_match else None
-        # Remove the /
-        # Split stderr into time output and actual stderr
-        time_lines = []
-        actual_stderr = []
-        for line in result.stderr.splitlines():
-            if (
-                line.startswith("\t")
-                or "Maximum resident set size" in line
-                or "Command being timed" in line
-                or "User time" in line
-                or "System time" in line
-                or "Percent of CPU" in line
-                or "Elapsed (wall clock) time" in line
-                or "Average" in line
-                or "Exit status" in line
-            ):
-                time_lines.append(line)
-            else:
-                actual_stderr.append(line)
-        cleaned_stderr = "\n".join(actual_stderr)
-        return result.stdout, cleaned_stderr, result.returncode, elapsed, max_memory
-    except subprocess.TimeoutExpired as e:
-        elapsed = time.time() - start_time
-        return "", f"Process timed out after {timeout} seconds", -1, elapsed, None
+        if HAS_WAITID:
+            # Wait for the child to exit without reaping it, so that its PID
+            # cannot be reused while the timer or the sampler may still use it
+            os.waitid(os.P_PID, pid, os.WEXITED | os.WNOWAIT)
+    except BaseException:
+        os.kill(pid, signal.SIGKILL)
+        raise
+    finally:
+        if timer and HAS_WAITID:
+            timer.cancel()
+            timer.join()
+        # Reap the child with wait4 to get its own resource usage,
+        # RUSAGE_CHILDREN would only report the maximum across all children.
+        _, status, rusage = os.wait4(pid, 0)
+        if timer:
+            # Without waitid the timer can only be cancelled after reaping
+            timer.cancel()
+        sampler.stop()
+    returncode = os.waitstatus_to_exitcode(status)
+    elapsed = time.perf_counter() - start_time
+
+    if timed_out.is_set() and returncode == -signal.SIGKILL:
+        stderr.write(f"Process timed out after {timeout} seconds".encode())
+        return -1, elapsed, None
+
+    # ru_maxrss of the child starts from the peak memory of this process,
+    # as it is carried over through fork and exec. So it is the peak memory
+    # of the child only if it is above that, otherwise use the sampled one.
+    max_memory = rusage.ru_maxrss
+    if max_memory <= resource.getrusage(resource.RUSAGE_SELF).ru_maxrss:
+        return returncode, elapsed, sampler.peak
+
+    # ru_maxrss is in kilobytes, except for macOS where it is in bytes
+    if IS_MACOS:
+        max_memory //= 1024
+
+    return returncode, elapsed, max_memory
+
+
+def error_tail(output):
+    """Decode the last ERROR_TAIL_SIZE bytes of a process output for logging"""
+    if len(output) <= ERROR_TAIL_SIZE:
+        return output.decode("utf-8", "replace")
+    return "...\n" + output[-ERROR_TAIL_SIZE:].decode("utf-8", "replace")
 
 
 def save_prover_log(
@@ -141,24 +239,69 @@ def save_prover_log(
 
     log_file = batch_dir / f"{step_name.lower()}.log"
 
-    with open(log_file, "w", encoding="utf-8") as f:
-        f.write(f"=== {step_name} STEP LOG ===\n")
-        f.write(f"Timestamp: {datetime.datetime.now().isoformat()}\n")
-        f.write(f"Return Code: {returncode}\n")
-        f.write(f"Execution Time: {elapsed:.2f} seconds\n")
-        if max_memory is not None:
-            f.write(f"Max Memory Usage: {max_memory/1024:.1f} MB\n")
-        f.write("\n")
+    header = (
+        f"=== {step_name} STEP LOG ===\n"
+        f"Timestamp: {datetime.datetime.now().isoformat()}\n"
+        f"Return Code: {returncode}\n"
+        f"Execution Time: {elapsed:.2f} seconds\n"
+    )
+    if max_memory is not None:
+        header += f"Max Memory Usage: {max_memory/1024:.1f} MB\n"
+
+    # Process output is copied from the files as is, without loading it in memory
+    with open(log_file, "wb") as f:
+        f.write(header.encode("utf-8"))
+        f.write(b"\n")
+
+        if stdout.seek(0, os.SEEK_END):
+            stdout.seek(0)
+            f.write(b"=== STDOUT ===\n")
+            shutil.copyfileobj(stdout, f)
+            f.write(b"\n")
 
-        if stdout:
-            f.write("=== STDOUT ===\n")
-            f.write(stdout)
-            f.write("\n")
+        if stderr.seek(0, os.SEEK_END):
+            stderr.seek(0)
+            f.write(b"=== STDERR ===\n")
+            shutil.copyfileobj(stderr, f)
+            f.write(b"\n")
 
-        if stderr:
-            f.write("=== STDERR ===\n")
-            f.write(stderr)
-            f.write("\n")
+
+def run_step(job_info, batch_dir, step_name, cmd):
+    """
+    Run a prover step and save its output to the step log.
+    Output is kept in memory only if the step fails, for error reporting.
+    """
+    # Joining the command is skipped entirely unless debug logging is enabled
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s [%s] command:\n%s", job_info, step_name, " ".join(cmd))
+
+    with tempfile.TemporaryFile() as stdout_file, tempfile.TemporaryFile() as stderr_file:
+        returncode, elapsed, max_memory = run(cmd, stdout_file, stderr_file)
+        save_prover_log(
+            batch_dir,
+            step_name,
+            stdout_file,
+            stderr_file,
+            returncode,
+            elapsed,
+            max_memory,
+        )
+
+        stdout = stderr = b""
+        if returncode != 0:
+            stdout_file.seek(0)
+            stdout = stdout_file.read()
+            stderr_file.seek(0)
+            stderr = stderr_file.read()
+
+    return StepInfo(
+        step=step_name,
+        stdout=stdout,
+        stderr=stderr,
+        returncode=returncode,
+        elapsed=elapsed,
+        max_memory=max_memory,
+    )
 
 
 def run_prover(job_info, executable, proof, arguments):
@@ -167,11 +310,12 @@ def run_prover(job_info, executable, proof, arguments):
     1. Generate a pie using cairo-execute
     2. Bootload using stwo-bootloader
     3. Prove using adapted_stwo
+    Paths are expected as Path objects and converted to strings only for the commands.
     Returns a tuple: (steps_info, total_elapsed, max_mem)
     steps_info is a list of dicts with keys: step, stdout, stderr, returncode, elapsed, max_memory
     """
     # Get the batch directory from the proof file path
-    batch_dir = Path(proof).parent
+    batch_dir = proof.parent
 
     # Prepare intermediate file paths within the batch directory
     pie_file = batch_dir / "pie.cairo_pie.zip"
@@ -188,27 +332,15 @@ def run_prover(job_info, executable, proof, arguments):
         "--layout",
         "all_cairo_stwo",
         "--args-file",
-        arguments,
+        str(arguments),
         "--prebuilt",
         "--output-path",
         str(pie_file),
-        executable,
+        str(executable),
     ]
-    logger.debug(f"{job_info} [PIE] command:\n{' '.join(map(str, pie_cmd))}")
-    stdout, stderr, returncode, elapsed, max_memory = run(pie_cmd)
-    steps_info.append(
-        StepInfo(
-            step="PIE",
-            stdout=stdout,
-            stderr=stderr,
-            returncode=returncode,
-            elapsed=elapsed,
-            max_memory=max_memory,
-        )
-    )
-    # Save PIE step log
-    save_prover_log(batch_dir, "PIE", stdout, stderr, returncode, elapsed, max_memory)
-    if returncode != 0:
+    step_info = run_step(job_info, batch_dir, "PIE", pie_cmd)
+    steps_info.append(step_info)
+    if step_info.returncode != 0:
         return steps_info
 
     # 2. Bootload
@@ -219,24 +351,11 @@ def run_prover(job_info, executable, proof, arguments):
         "--output-path",
         str(batch_dir),
     ]
-    logger.debug(f"{job_info} [BOOTLOAD] command:\n{' '.join(map(str, bootload_cmd))}")
-    stdout, stderr, returncode, elapsed, max_memory = run(bootload_cmd)
-    steps_info.append(
-        StepInfo(
-            step="BOOTLOAD",
-            stdout=stdout,
-            stderr=stderr,
-            returncode=returncode,
-            elapsed=elapsed,
-            max_memory=max_memory,
-        )
-    )
-    # Save BOOTLOAD step log
-    save_prover_log(
-        batch_dir, "BOOTLOAD", stdout, stderr, returncode, elapsed, max_memory
-    )
-    if returncode != 0:
-        logger.error(f"{job_info} [BOOTLOAD] error: {stdout or stderr}")
+    step_info = run_step(job_info, batch_dir, "BOOTLOAD", bootload_cmd)
+    steps_info.append(step_info)
+    if step_info.returncode != 0:
+        error = error_tail(step_info.stdout or step_info.stderr)
+        logger.error(f"{job_info} [BOOTLOAD] error: {error}")
         return steps_info
 
     # 3. Prove
@@ -247,41 +366,27 @@ def run_prover(job_info, executable, proof, arguments):
         "--pub_json",
         str(pub_json),
         "--params_json",
-        "../../packages/assumevalid/prover_params.json",
+        str(PROVER_PARAMS),
         "--proof_path",
         str(proof),
         "--proof-format",
         "cairo-serde",
         "--verify",
     ]
-    logger.debug(f"{job_info} [PROVE] command:\n{' '.join(map(str, prove_cmd))}")
-    stdout, stderr, returncode, elapsed, max_memory = run(prove_cmd)
-
-    steps_info.append(
-        StepInfo(
-            step="PROVE",
-            stdout=stdout,
-            stderr=stderr,
-            returncode=returncode,
-            elapsed=elapsed,
-            max_memory=max_memory,
-        )
-    )
-    # Save PROVE step log (stwo prover output)
-    save_prover_log(batch_dir, "PROVE", stdout, stderr, returncode, elapsed, max_memory)
+    step_info = run_step(job_info, batch_dir, "PROVE", prove_cmd)
+    steps_info.append(step_info)
 
-    if returncode == 0:
+    if step_info.returncode == 0:
         temp_files = [pie_file, pub_json]
 
         # Parse priv.json to get trace and memory file paths
         if priv_json.exists():
             try:
-                with open(priv_json, "r") as f:
-                    priv_data = json.load(f)
-                    if "trace_path" in priv_data:
-                        temp_files.append(Path(priv_data["trace_path"]))
-                    if "memory_path" in priv_data:
-                        temp_files.append(Path(priv_data["memory_path"]))
+                priv_data = json_loads(priv_json.read_bytes())
+                if "trace_path" in priv_data:
+                    temp_files.append(Path(priv_data["trace_path"]))
+                if "memory_path" in priv_data:
+                    temp_files.append(Path(priv_data["memory_path"]))
                 temp_files.append(
                     priv_json
                 )  # Add priv.json itself after extracting paths
@@ -293,54 +398,164 @@ def run_prover(job_info, executable, proof, arguments):
             try:
                 if temp_file.exists():
                     temp_file.unlink()
-                    logger.debug(f"Cleaned up temporary file: {temp_file}")
+                    logger.debug("Cleaned up temporary file: %s", temp_file)
             except Exception as e:
                 logger.warning(f"Failed to clean up {temp_file}: {e}")
 
     return steps_info
 
 
-def prove_batch(height, step):
+def get_batch_dir(height, step, mode="light"):
+    """Directory with all files of the batch starting at the given height"""
+    return PROOF_DIR / f"{mode}_{height}_to_{height + step}"
+
+
+@lru_cache(maxsize=None)
+def get_args_cache_dir():
+    """
+    Get the directory with cached block arguments for the current code version.
+    The version covers the git revision and the sources of the modules producing
+    the arguments, so that both commits and uncommitted changes invalidate the cache.
+    Returns None if the git revision cannot be determined.
+    """
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True)
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    version = hashlib.blake2b(result.stdout, digest_size=16)
+    scripts_dir = Path(__file__).resolve().parent
+    for source in ARGS_CACHE_SOURCES:
+        version.update((scripts_dir / source).read_bytes())
+    return ARGS_CACHE_DIR / version.hexdigest()
+
+
+def prune_args_cache():
+    """Remove cached block arguments of other code versions"""
+    if not ARGS_CACHE_DIR.is_dir():
+        return
+    cache_dir = get_args_cache_dir()
+    for entry in ARGS_CACHE_DIR.iterdir():
+        if entry == cache_dir:
+            continue
+        if entry.is_dir():
+            shutil.rmtree(entry, ignore_errors=True)
+        else:
+            entry.unlink(missing_ok=True)
+
+
+def get_args_cache_file(height, step, mode="light"):
+    """
+    Get the file with cached block arguments for a batch.
+    Returns None if caching is not possible.
+    """
+    cache_dir = get_args_cache_dir()
+    if cache_dir is None:
+        return None
+    key = hashlib.blake2b(f"{mode}|{height}|{step}".encode(), digest_size=16)
+    return cache_dir / f"{key.hexdigest()}.args.bin"
+
+
+def get_batch_file(height, step, mode="light"):
+    """File with batch data, kept only if requested"""
+    return get_batch_dir(height, step, mode) / "batch.json"
+
+
+def find_saved_batch_data(height, step, force_regen=False, mode="light"):
+    """
+    Find data for a batch saved by a previous run, to be used instead of fetching it.
+    Returns the cached arguments file if any, otherwise the kept batch file if any,
+    otherwise or if `force_regen` is set None.
+    """
+    if force_regen:
+        return None
+    args_cache_file = get_args_cache_file(height, step, mode)
+    if args_cache_file is not None and args_cache_file.exists():
+        return args_cache_file
+    batch_file = get_batch_file(height, step, mode)
+    return batch_file if batch_file.exists() else None
+
+
+def generate_batch_args(height, step, mode="light"):
+    """Fetch chain state and blocks for a batch starting at the given height"""
+    batch_data = generate_data(
+        mode=mode, initial_height=height, num_blocks=step, fast=True
+    )
+    return {
+        "chain_state": batch_data["chain_state"],
+        "blocks": batch_data["blocks"],
+    }
+
+
+def prove_batch(
+    height,
+    step,
+    batch_args_future=None,
+    previous_proof_file=None,
+    force_regen=False,
+    keep_intermediate=False,
+):
+    """
+    Prove a batch of blocks starting at the given height.
+    If `batch_args_future` is provided, batch data is taken from it
+    instead of being fetched synchronously.
+    Otherwise arguments cached or batch data saved by a previous run are reused,
+    unless `force_regen` is set.
+    Fetched batch data is saved to the batch directory only if `keep_intermediate` is set.
+    If `previous_proof_file` is not provided, it is looked up in the proof directory.
+    Returns the path to the resulting proof file or None on failure.
+    """
 
     mode = "light"
     job_info = f"Job(height='{height}', blocks={step})"
 
-    logger.debug(f"{job_info} proving...")
+    logger.debug("%s proving...", job_info)
 
     try:
         # Create dedicated directory for this proof batch
-        batch_name = f"{mode}_{height}_to_{height + step}"
-        batch_dir = PROOF_DIR / batch_name
+        batch_dir = get_batch_dir(height, step, mode)
         batch_dir.mkdir(exist_ok=True)
 
         # Previous Proof - look for it in the previous batch directory
-        previous_proof_file = None
-        if height > 0:
+        if previous_proof_file is None and height > 0:
             # Find the previous proof by looking for the directory that ends at current height
             for proof_dir in PROOF_DIR.glob(f"{mode}_*_to_{height}"):
                 previous_proof_file = proof_dir / "proof.json"
                 if previous_proof_file.exists():
                     break
 
-        logger.debug(f"{job_info} generating data...")
-
-        # Batch data - store in the batch directory
-        batch_file = batch_dir / "batch.json"
-        batch_data = generate_data(
-            mode=mode, initial_height=height, num_blocks=step, fast=True
-        )
-        batch_args = {
-            "chain_state": batch_data["chain_state"],
-            "blocks": batch_data["blocks"],
-        }
-        batch_file.write_text(json.dumps(batch_args, indent=2))
+        # Batch data - optionally store in the batch directory
+        batch_file = get_batch_file(height, step, mode)
+        args_cache_file = get_args_cache_file(height, step, mode)
+        saved_data = None
+        if batch_args_future is None:
+            saved_data = find_saved_batch_data(height, step, force_regen, mode)
+        if saved_data is not None and saved_data == args_cache_file:
+            logger.debug("%s reusing cached args...", job_info)
+            batch_data = None
+        elif saved_data is not None:
+            logger.debug("%s reusing existing data...", job_info)
+            batch_data = saved_data
+        else:
+            logger.debug("%s generating data...", job_info)
+            if batch_args_future is not None:
+                batch_data = batch_args_future.result()
+            else:
+                batch_data = generate_batch_args(height, step, mode)
+            if keep_intermediate:
+                # Write atomically so that an interrupted run never leaves partial data
+                tmp_batch_file = batch_file.with_suffix(".tmp")
+                tmp_batch_file.write_bytes(json_dumps(batch_data))
+                tmp_batch_file.replace(batch_file)
 
-        logger.debug(f"{job_info} generating args...")
+        logger.debug("%s generating args...", job_info)
 
         # Arguments file - store in the batch directory
         arguments_file = batch_dir / "arguments.json"
-        args = generate_assumevalid_args(batch_file, previous_proof_file)
-        arguments_file.write_text(json.dumps(args))
+        write_assumevalid_args(
+            arguments_file, batch_data, previous_proof_file, args_cache_file
+        )
 
         # Final proof file - store in the batch directory
         proof_file = batch_dir / "proof.json"
@@ -348,9 +563,9 @@ def prove_batch(height, step):
         # run prover
         steps_info = run_prover(
             job_info,
-            "../../target/proving/assumevalid.executable.json",
-            str(proof_file),
-            str(arguments_file),
+            EXECUTABLE,
+            proof_file,
+            arguments_file,
         )
 
         total_elapsed = sum(step.elapsed for step in steps_info)
@@ -363,19 +578,24 @@ def prove_batch(height, step):
         last_step = steps_info[-1]
         final_return_code = last_step.returncode
         if final_return_code != 0:
-            error = last_step.stderr or last_step.stdout
+            error = error_tail(last_step.stderr or last_step.stdout)
             logger.error(f"{job_info} error:\n{error}")
-            return False
+            return None
         else:
-            for info in steps_info:
-                mem_usage = (
-                    f"{info.max_memory/1024:.1f} MB"
-                    if info.max_memory is not None
-                    else "N/A"
-                )
-                logger.debug(
-                    f"{job_info}, [{info.step}] time: {info.elapsed:.2f} s max memory: {mem_usage}"
-                )
+            if logger.isEnabledFor(logging.DEBUG):
+                for info in steps_info:
+                    mem_usage = (
+                        f"{info.max_memory/1024:.1f} MB"
+                        if info.max_memory is not None
+                        else "N/A"
+                    )
+                    logger.debug(
+                        "%s, [%s] time: %.2f s max memory: %s",
+                        job_info,
+                        info.step,
+                        info.elapsed,
+                        mem_usage,
+                    )
             logger.info(
                 f"{job_info} done, total execution time: {total_elapsed:.2f} seconds"
                 + (
@@ -385,25 +605,27 @@ def prove_batch(height, step):
                 )
             )
 
-            return True
+            return proof_file
 
     except Exception as e:
         logger.error(
             f"{job_info} error while processing {job_info}:\n{e}\nstacktrace:\n{traceback.format_exc()}"
         )
-        return False
+        return None
 
 
-def main(start, blocks, step):
+def main(start, blocks, step, jobs=1, force_regen=False, keep_intermediate=False):
 
     logger.info(
-        "Initial height: %d, blocks: %d, step: %d",
+        "Initial height: %d, blocks: %d, step: %d, jobs: %d",
         start,
         blocks,
         step,
+        jobs,
     )
 
     PROOF_DIR.mkdir(exist_ok=True)
+    prune_args_cache()
 
     end = start + blocks
 
@@ -412,16 +634,40 @@ def main(start, blocks, step):
     processing_step = step
 
     processed_count = 0
-    total_jobs = len(list(height_range))
-
-    # Process jobs sequentially
-    for height in height_range:
-        success = prove_batch(height, processing_step)
-        if success:
-            processed_count += 1
-        else:
-            logger.info(f"Job at height: {height} failed, stopping further processing")
-            return
+    previous_proof_file = None
+
+    # Process jobs sequentially since every proof depends on the previous one,
+    # but fetch data for up to `jobs` next jobs concurrently while proving
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        batches = {}
+        for i, height in enumerate(height_range):
+            for next_height in height_range[i : i + jobs + 1]:
+                if next_height in batches:
+                    continue
+                if find_saved_batch_data(next_height, processing_step, force_regen):
+                    # Data saved by a previous run is reused, nothing to fetch
+                    batches[next_height] = None
+                else:
+                    batches[next_height] = executor.submit(
+                        generate_batch_args, next_height, processing_step
+                    )
+            # Proof of this job is passed to the next one, no need to look it up
+            previous_proof_file = prove_batch(
+                height,
+                processing_step,
+                batches.pop(height),
+                previous_proof_file,
+                force_regen,
+                keep_intermediate,
+            )
+            if previous_proof_file is not None:
+                processed_count += 1
+            else:
+                logger.info(
+                    f"Job at height: {height} failed, stopping further processing"
+                )
+                executor.shutdown(cancel_futures=True)
+                return
 
     logger.info(f"All {processed_count} jobs have been processed successfully")
 
@@ -429,25 +675,40 @@ def main(start, blocks, step):
 def auto_detect_start():
     """Auto-detect the starting height by finding the highest ending height from existing proof directories."""
     max_height = 0
-    pattern = re.compile(r"light_\d+_to_(\d+)")
 
     if not PROOF_DIR.exists():
         return max_height
 
-    for proof_dir in PROOF_DIR.iterdir():
-        if proof_dir.is_dir():
-            m = pattern.match(proof_dir.name)
-            if m:
-                # Check if the proof file actually exists
-                proof_file = proof_dir / "proof.json"
-                if proof_file.exists():
-                    end_height = int(m.group(1))
-                    if end_height > max_height:
-                        max_height = end_height
+    with os.scandir(PROOF_DIR) as entries:
+        for entry in entries:
+            # Directory names have the form light_{start}_to_{end}
+            if not entry.name.startswith("light_") or not entry.is_dir():
+                continue
+            try:
+                end_height = int(entry.name.partition("_to_")[2])
+            except ValueError:
+                continue
+            # Check if the proof file actually exists, only for a new maximum
+            if end_height > max_height and os.path.exists(
+                os.path.join(entry.path, "proof.json")
+            ):
+                max_height = end_height
     return max_height
 
 
-if __name__ == "__main__":
+def positive_int(value):
+    """Parse a command line argument that must be a positive integer"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def cli(argv=None):
+    """Command line entry point, `argv` defaults to sys.argv"""
     parser = argparse.ArgumentParser(description="Run single-threaded client script")
     parser.add_argument(
         "--start",
@@ -461,9 +722,25 @@ if __name__ == "__main__":
     parser.add_argument(
         "--step", type=int, default=10, help="Step size for block processing"
     )
+    parser.add_argument(
+        "--jobs",
+        type=positive_int,
+        default=1,
+        help="Number of batches to fetch data for in parallel with proving",
+    )
+    parser.add_argument(
+        "--force-regen",
+        action="store_true",
+        help="Fetch batch data even if it was saved by a previous run",
+    )
+    parser.add_argument(
+        "--keep-intermediate",
+        action="store_true",
+        help="Save fetched batch data to the batch directory for later runs",
+    )
     parser.add_argument("--verbose", action="store_true", help="Verbose logging")
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Setup logging using the extracted function
     setup_logging(verbose=args.verbose)
@@ -473,4 +750,15 @@ if __name__ == "__main__":
         start = auto_detect_start()
         logger.info(f"Auto-detected start: {start}")
 
-    main(start, args.blocks, args.step)
+    main(
+        start,
+        args.blocks,
+        args.step,
+        args.jobs,
+        args.force_regen,
+        args.keep_intermediate,
+    )
+
+
+if __name__ == "__main__":
+    cli()